@@ -1,43 +1,119 @@
 import os
+import tempfile
 
-from fastapi import APIRouter, HTTPException
+import aiofiles
+import aiofiles.os
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
-from backend.models.model import SheetModel
+from backend.models.model import SHEET_MODEL_ADAPTER, SheetModel
 
-router = APIRouter(prefix="/config")
+router = APIRouter(prefix="/config", default_response_class=ORJSONResponse)
 
 SHEET_MODEL_PATH = os.path.join("uploads", "sheet_model.json")
 
+_SHEET_MODEL_NOT_FOUND = "Sheet model configuration file not found"
 
-@router.get("/sheet_model", tags=["Config"])
-async def get_sheet_model() -> SheetModel:
+# path -> (mtime_ns, file content) of config files served by this router
+_MODEL_CACHE: dict[str, tuple[int, bytes]] = {}
+
+# path -> (mtime_ns, error) of config files that failed validation on startup
+_INVALID_MODELS: dict[str, tuple[int, str]] = {}
+
+
+# mkstemp creates files readable by the owner only; written config files get
+# the mode a plain open() would give them. Reading the umask means setting it,
+# so this is done once at import time
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+async def _write_atomic(path: str, content: bytes) -> None:
+    """Writes to a temporary file and moves it into place, so readers never
+    see a partially written config file."""
+    # A unique name in the same directory keeps concurrent writers apart and
+    # the final replace on one filesystem
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        os.chmod(tmp_path, _FILE_MODE)
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(content)
+        await aiofiles.os.replace(tmp_path, path)
+    except BaseException:
+        await aiofiles.os.remove(tmp_path)
+        raise
+
+
+@router.get("/sheet_model", tags=["Config"], response_model=SheetModel)
+async def get_sheet_model() -> Response:
     """Gets sheet model configuration from json file in uploads directory"""
     # check if file exists
-    if not os.path.exists(SHEET_MODEL_PATH):
+    try:
+        st = await aiofiles.os.stat(SHEET_MODEL_PATH)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=_SHEET_MODEL_NOT_FOUND)
+
+    invalid = _INVALID_MODELS.get(SHEET_MODEL_PATH)
+    if invalid and invalid[0] == st.st_mtime_ns:
         raise HTTPException(
-            status_code=404,
-            detail="Sheet model configuration file not found",
+            status_code=422,
+            detail={
+                "status": "error",
+                "message": f"Stored sheet model is invalid: {invalid[1]}",
+            },
         )
-    with open(SHEET_MODEL_PATH, "r") as f:
-        model = SheetModel.model_validate_json(f.read())
-    return model
+
+    entry = _MODEL_CACHE.get(SHEET_MODEL_PATH)
+    if entry and entry[0] == st.st_mtime_ns:
+        return Response(content=entry[1], media_type="application/json")
+
+    # The file is server-owned: it is only written by `save_sheet_model` after
+    # validation and re-checked on startup, so it is served without re-parsing.
+    async with aiofiles.open(SHEET_MODEL_PATH, "rb") as f:
+        content = await f.read()
+    _MODEL_CACHE[SHEET_MODEL_PATH] = (st.st_mtime_ns, content)
+    return Response(content=content, media_type="application/json")
+
+
+def validate_stored_sheet_model() -> None:
+    """Validates the stored sheet model once. An invalid file is kept for the
+    user to fix or overwrite; until then it is reported instead of served."""
+    try:
+        st = os.stat(SHEET_MODEL_PATH)
+        with open(SHEET_MODEL_PATH, "rb") as f:
+            SHEET_MODEL_ADAPTER.validate_json(f.read())
+    except FileNotFoundError:
+        return
+    except ValueError as e:
+        logger.error("Stored sheet model configuration is invalid: {}", e)
+        _INVALID_MODELS[SHEET_MODEL_PATH] = (st.st_mtime_ns, str(e))
 
 
 @router.post("/sheet_model", tags=["Config"])
 async def save_sheet_model(sheet_model: SheetModel):
     """Saves sheet model configuration to json file in uploads directory"""
     # Ensure uploads directory exists
-    os.makedirs(os.path.dirname(SHEET_MODEL_PATH), exist_ok=True)
+    await aiofiles.os.makedirs(os.path.dirname(SHEET_MODEL_PATH), exist_ok=True)
 
-    with open(SHEET_MODEL_PATH, "w") as f:
-        f.write(sheet_model.model_dump_json(indent=4))
+    await _write_atomic(
+        SHEET_MODEL_PATH, SHEET_MODEL_ADAPTER.dump_json(sheet_model, indent=4)
+    )
+    _MODEL_CACHE.pop(SHEET_MODEL_PATH, None)
+    _INVALID_MODELS.pop(SHEET_MODEL_PATH, None)
 
 
 @router.delete("/sheet_model", tags=["Config"])
 async def delete_sheet_model():
     """Deletes sheet model configuration from json file in uploads directory"""
-    os.remove(SHEET_MODEL_PATH)
+    try:
+        await aiofiles.os.remove(SHEET_MODEL_PATH)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=_SHEET_MODEL_NOT_FOUND)
+    _MODEL_CACHE.pop(SHEET_MODEL_PATH, None)
+    _INVALID_MODELS.pop(SHEET_MODEL_PATH, None)
 
 
 @router.get("/test_schema", tags=["Config"])
@@ -48,9 +124,3 @@ async def test_schema():
     data = SmallMolecule.model_json_schema()
     logger.info(data)
     return data
-
-
-if __name__ == "__main__":
-    from pyenzyme.versions.v2 import SmallMolecule
-
-    print(SmallMolecule.model_json_schema())
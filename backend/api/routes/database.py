@@ -1,37 +1,38 @@
 from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
 from backend.models.graph_model import GraphModel
 
 from ...services.database import DB
 
-router = APIRouter(prefix="/database")
+router = APIRouter(prefix="/database", default_response_class=ORJSONResponse)
 
 
 @router.get("/health", tags=["Database"])
 async def get_database_health(db: DB) -> dict[str, str]:
     """Get the current status of the database connection."""
-    response = db.execute_query("RETURN 'healthy'")
-    logger.info(f"Database health check response: {response}")
+    response = await db.execute_query_async("RETURN 'healthy'")
+    logger.info("Database health check response: {}", response)
     return response[0]
 
 
 @router.get("/status", tags=["Database"])
-async def get_database_status(db: DB) -> dict[str, int]:
+def get_database_status(db: DB) -> dict[str, int]:
     """Get the current status of the database connection."""
     return db.node_count
 
 
 @router.get("/db_structure", tags=["Database"])
-async def get_database_structure(db: DB) -> GraphModel:
+def get_database_structure(db: DB) -> GraphModel:
     """Get the structure of the database."""
     return db.get_db_structure
 
 
 @router.get("/node_properties", tags=["Database"])
-async def get_node_properties(db: DB) -> Any:
+def get_node_properties(db: DB) -> Any:
     """Get the node properties of the database."""
     return db.node_properties
 
@@ -39,6 +40,27 @@ async def get_node_properties(db: DB) -> Any:
 @router.delete("/delete_all", tags=["Database"])
 async def delete_all(db: DB) -> dict[str, str]:
     """Delete all nodes and relationships from the database."""
-    query = "MATCH (n) DETACH DELETE n"
-    db.execute_query(query)
+    # delete in batches so the whole graph is never held in one transaction
+    query = """
+        CALL apoc.periodic.iterate(
+            "MATCH (n) RETURN n",
+            "DETACH DELETE n",
+            {batchSize: 10000}
+        )
+        YIELD failedBatches, errorMessages
+        RETURN failedBatches, errorMessages
+        """
+    result = (await db.execute_query_async(query))[0]
+    # batches that did commit are gone either way
+    db.invalidate_schema_cache()
+    if result["failedBatches"] > 0 or result["errorMessages"]:
+        logger.error("Deleting all nodes failed: {}", result["errorMessages"])
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Failed to delete {result['failedBatches']} batch(es): "
+                f"{result['errorMessages']}",
+            },
+        )
     return {"message": "All nodes and relationships deleted"}
@@ -1,58 +1,157 @@
-from typing import Annotated
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Annotated, Any
 
-from agents import Runner
-from fastapi import APIRouter, Body
+import orjson
+from agents import Runner, RunResult
+from fastapi import APIRouter, Body, Response
 from loguru import logger
 from neo4j.exceptions import ClientError
 
-from backend.llm.agents import data_analysis_agent, question_dispatcher_agent
-from backend.services.database import DB
+from backend.llm.agents import (
+    data_analysis_agent,
+    llm_slots,
+    question_dispatcher_agent,
+)
+from backend.services.database import DB, Database
 
 router = APIRouter(prefix="/llm")
 
+MAX_ASK_RETRIES = 2
+ASK_TIMEOUT_SECONDS = 30
 
-@router.post("/ask", tags=["Chat"])
+MAX_CACHED_QUERIES = 256
+
+# question -> dispatcher run currently in flight for it
+_in_flight: dict[str, asyncio.Task[RunResult]] = {}
+
+# (question, schema fingerprint) -> Cypher query that answered it, in LRU order
+_cypher_cache: OrderedDict[tuple[str, bytes], str] = OrderedDict()
+
+
+async def _schema_fingerprint(db: Database) -> bytes:
+    """Digest of the current graph schema; generated Cypher is only reused
+    while the schema it was written against is unchanged. Only labels,
+    property names and relationship types count, example values do not."""
+    schema = await asyncio.to_thread(lambda: db.get_graph_info_dict)
+    names = {
+        "nodes": {
+            node.name: sorted(attr.attr_name for attr in node.attributes)
+            for node in schema["nodes"]
+        },
+        "relationships": sorted(
+            [rel.source, rel.name, sorted(rel.targets)]
+            for rel in schema["relationships"]
+        ),
+        "relationship_properties": {
+            rel["type"]: sorted(rel["properties"])
+            for rel in schema["relationship_properties"]
+        },
+    }
+    payload = orjson.dumps(names, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _remember_query(key: tuple[str, bytes], query: str) -> None:
+    _cypher_cache[key] = query
+    _cypher_cache.move_to_end(key)
+    if len(_cypher_cache) > MAX_CACHED_QUERIES:
+        _cypher_cache.popitem(last=False)
+
+
+async def _dispatch(question: str) -> RunResult:
+    async with llm_slots:
+        return await Runner.run(
+            starting_agent=question_dispatcher_agent,
+            input=question,
+        )
+
+
+async def _run_dispatcher(question: str) -> RunResult:
+    """Runs the dispatcher agent, coalescing identical concurrent questions
+    into a single agent run."""
+    task = _in_flight.get(question)
+    if task is None:
+        task = asyncio.create_task(_dispatch(question))
+        _in_flight[question] = task
+        task.add_done_callback(lambda _: _in_flight.pop(question, None))
+    # shielded so a disconnecting client does not cancel the run for the others
+    return await asyncio.shield(task)
+
+
+def _data_table_response(data: list[dict[str, Any]]) -> Response:
+    """Encodes query results in one orjson pass. Returning a `Response` skips
+    FastAPI's `jsonable_encoder` walk over every record; `default=str` covers
+    Neo4j temporal and spatial values."""
+    return Response(
+        orjson.dumps({"model": "data_table", "data": data}, default=str),
+        media_type="application/json",
+    )
+
+
+@router.post("/ask", tags=["Chat"], response_model=None)
 async def ask(
     question: Annotated[str, Body()],
     db: DB,
-    run_count: int = 0,
-) -> dict[str, str]:
+) -> Response | dict[str, str]:
     """Handle ask requests with provided OpenAI API key."""
-    try:
-        if run_count > 2:
-            return {
-                "model": "text",
-                "data": "I'm sorry, I'm having trouble processing your request. Please try again.",
-            }
-
-        result = await Runner.run(
-            starting_agent=question_dispatcher_agent,
-            input=question,
-        )
+    deadline = time.monotonic() + ASK_TIMEOUT_SECONDS
+    prompt = question
+    run_count = 0
 
-        if result.last_agent.name == data_analysis_agent.name:
-            logger.info(
-                f"Question answer by {data_analysis_agent.name}: {result.final_output[:20]}..."
-            )
-            return {"model": "text", "data": result.final_output}
+    # a repeated question on an unchanged schema skips the agent round trip;
+    # the query itself still runs, so the returned data is always current
+    key = (question, await _schema_fingerprint(db))
+    cached_query = _cypher_cache.get(key)
+    if cached_query is not None:
+        try:
+            data = await db.execute_read_async(cached_query)
+            _cypher_cache.move_to_end(key)
+            return _data_table_response(data)
+        except ClientError:
+            _cypher_cache.pop(key, None)
+
+    while run_count <= MAX_ASK_RETRIES and time.monotonic() < deadline:
+        result = await _run_dispatcher(prompt)
 
+        # `{:.20}` truncates while the message is formatted, which loguru
+        # skips when INFO is filtered out
         logger.info(
-            f"Question answer by {result.last_agent.name}: {result.final_output[:20]}..."
+            "Question answer by {}: {:.20}...",
+            result.last_agent.name,
+            result.final_output,
         )
 
-        return {"model": "data_table", "data": db.execute_query(result.final_output)}
+        if result.last_agent.name == data_analysis_agent.name:
+            return {"model": "text", "data": result.final_output}
 
-    except ClientError as e:
-        run_count += 1
-        logger.error(
-            f"We Got client error. Retrying for the {run_count} time: {str(e)}"
-        )
-        new_question = f"""
-        The user asked: ```{question}```
-        From your previous response, I can see that you tried to execute the following query: ```{result.final_output}```
-        This cause the following error: ```{str(e)}```
-        Please try to fix the query and execute it again.
-        """
-        logger.info(f"New question: {new_question[:20]}...")
-        # rerun the agent with error message
-        return await ask(new_question, db, run_count)
+        try:
+            data = await db.execute_read_async(result.final_output)
+            if run_count:
+                # the schema was re-read after the failed attempt
+                key = (question, await _schema_fingerprint(db))
+            _remember_query(key, result.final_output)
+            return _data_table_response(data)
+        except ClientError as e:
+            run_count += 1
+            # the query may have failed against a schema that changed since
+            # it was cached, so the retry should see the current one
+            db.invalidate_schema_cache()
+            logger.error(
+                "We Got client error. Retrying for the {} time: {}", run_count, e
+            )
+            # rerun the agent with error message
+            prompt = f"""
+            The user asked: ```{question}```
+            From your previous response, I can see that you tried to execute the following query: ```{result.final_output}```
+            This cause the following error: ```{e}```
+            Please try to fix the query and execute it again.
+            """
+            logger.info("New question: {:.20}...", prompt)
+
+    return {
+        "model": "text",
+        "data": "I'm sorry, I'm having trouble processing your request. Please try again.",
+    }
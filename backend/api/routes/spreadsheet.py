@@ -1,29 +1,103 @@
+import asyncio
 import os
-from io import BytesIO
+import shutil
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Annotated, Any, Dict, List
+from tempfile import SpooledTemporaryFile
+from typing import Annotated, Any, BinaryIO, Dict, List
 
-import pandas as pd
+import aiofiles.os
+import xlsxwriter
 from fastapi import APIRouter, Body, File, HTTPException, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from starlette.background import BackgroundTask
 
-from backend.models.model import SheetModel
+from backend.exceptions import TYPE_INCONSISTENCIES_ADAPTER
+from backend.models.model import SHEET_MODEL_ADAPTER, SheetModel
 from backend.services.database import DB
 from backend.services.database_populator import DatabasePopulator
 from backend.services.sheet_extractor import SheetModelBuilder
 
-router = APIRouter(prefix="/spreadsheet")
+router = APIRouter(prefix="/spreadsheet", default_response_class=ORJSONResponse)
 
 # Define uploads directory relative to project root
 UPLOAD_DIR = Path("uploads")
+UPLOAD_CHUNK_SIZE = 1 << 20
+SHEET_MODEL_PATH = str(UPLOAD_DIR / "sheet_model.json")
+GENERATE_SPOOL_SIZE = 32 * 1024 * 1024
 
 
 class SpreadsheetRequest(BaseModel):
     data: List[Dict[str, Any]]
 
 
+def _resolve_upload(path: str) -> str:
+    """Strips quotes from a spreadsheet path and resolves relative paths
+    against the uploads directory.
+
+    Raises:
+        FileNotFoundError: If no file exists at the resolved path
+    """
+    path = path.strip('"').strip("'")
+    if not os.path.isabs(path) and not path.startswith(f"{UPLOAD_DIR}/"):
+        path = os.path.join(UPLOAD_DIR, path)
+    # a single stat, instead of separate exists checks per branch
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"File not found at path: {path}")
+    return path
+
+
+# The mtime is part of the cache keys below, so a changed file is re-read
+# automatically and stale entries simply age out of the LRU.
+
+
+@lru_cache(maxsize=8)
+def _load_builder(path: str, mtime_ns: int) -> SheetModelBuilder:
+    """Parses a workbook once; shared by `/validate_spreadsheet` and `/process`."""
+    return SheetModelBuilder(path=path)
+
+
+# One lock per workbook in use, so concurrent requests for the same file parse
+# it once; a lock is dropped when its last user is done with it
+_builder_locks: dict[str, asyncio.Lock] = {}
+_builder_lock_users: Counter[str] = Counter()
+
+
+async def _get_builder(path: str) -> SheetModelBuilder:
+    """Returns the cached builder for `path`, parsing it off the event loop."""
+    st = await aiofiles.os.stat(path)
+    lock = _builder_locks.setdefault(path, asyncio.Lock())
+    _builder_lock_users[path] += 1
+    try:
+        async with lock:
+            return await asyncio.to_thread(_load_builder, path, st.st_mtime_ns)
+    finally:
+        _builder_lock_users[path] -= 1
+        if not _builder_lock_users[path]:
+            del _builder_lock_users[path]
+            del _builder_locks[path]
+
+
+@lru_cache(maxsize=4)
+def _load_sheet_model(path: str, mtime_ns: int) -> SheetModel:
+    with open(path, "rb") as f:
+        return SHEET_MODEL_ADAPTER.validate_json(f.read())
+
+
+# Serializes cache misses so concurrent /process calls parse the model once
+_sheet_model_lock = asyncio.Lock()
+
+
+def _save_upload(source: BinaryIO, destination: Path) -> int:
+    """Copies an upload to disk without holding it in memory; returns its size."""
+    with open(destination, "wb") as buffer:
+        shutil.copyfileobj(source, buffer, UPLOAD_CHUNK_SIZE)
+        return buffer.tell()
+
+
 @router.post("/upload", tags=["Spreadsheet"])
 async def upload_spreadsheet(file: UploadFile = File(...)):
     """Uploads the spreadsheet and returns the file path.
@@ -35,7 +109,7 @@ async def upload_spreadsheet(file: UploadFile = File(...)):
         if not file:
             raise ValueError("No file provided")
 
-        logger.info(f"Processing upload request for file: {file.filename}")
+        logger.info("Processing upload request for file: {}", file.filename)
 
         # Ensure upload directory exists
         UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -43,29 +117,32 @@ async def upload_spreadsheet(file: UploadFile = File(...)):
         # Create file path using Path for consistent handling
         file_path = UPLOAD_DIR / str(file.filename)
 
-        logger.debug(f"Saving file to: {file_path}")
+        logger.debug("Saving file to: {}", file_path)
+
+        if file.size == 0:
+            raise ValueError("Uploaded file is empty")
+
+        # Copy the spooled upload in chunks, in one worker-thread hop
+        written = await asyncio.to_thread(_save_upload, file.file, file_path)
 
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            if not content:
-                raise ValueError("Uploaded file is empty")
-            buffer.write(content)
+        if written == 0:
+            await aiofiles.os.remove(file_path)
+            raise ValueError("Uploaded file is empty")
 
-        logger.info(f"File saved successfully at: {file_path}")
+        logger.info("File saved successfully at: {}", file_path)
         # Return plain path without quotes
         return str(file_path)
 
     except ValueError as e:
-        logger.error(f"Upload validation error: {str(e)}")
+        logger.error("Upload validation error: {}", e)
         raise HTTPException(
             status_code=400, detail={"status": "error", "message": str(e)}
         )
     except Exception as e:
-        logger.error(f"Error uploading file: {str(e)}")
+        logger.error("Error uploading file: {}", e)
         raise HTTPException(
             status_code=500,
-            detail={"status": "error", "message": f"Error uploading file: {str(e)}"},
+            detail={"status": "error", "message": f"Error uploading file: {e}"},
         )
 
 
@@ -89,60 +166,47 @@ async def validate_spreadsheet(path: str):
         if not path:
             raise ValueError("No file path provided")
 
-        # Strip quotes and decode URL-encoded characters
-        path = path.strip('"').strip("'")
-
-        # Check if absolute path exists
-        if os.path.isabs(path) and os.path.exists(path):
-            file_path = path
-        # If not absolute and not at uploads/ prefix
-        elif not path.startswith("uploads/") and not path.startswith("/"):
-            # Try with uploads/ prefix
-            file_path = os.path.join("uploads", path)
-        else:
-            file_path = path
-
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found at path: {file_path}")
+        file_path = _resolve_upload(path)
 
-        builder = SheetModelBuilder(path=file_path)
-        validation_errors = builder.validate_spreadsheet_data()
+        builder = await _get_builder(file_path)
+        # type checks walk every cell, so keep them off the event loop
+        validation_errors = await asyncio.to_thread(builder.validate_spreadsheet_data)
 
         if validation_errors:
-            logger.warning(f"Found {len(validation_errors)} type inconsistencies")
-            return JSONResponse(
+            logger.warning("Found {} type inconsistencies", len(validation_errors))
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "status": "error",
-                    "type_inconsistencies": [
-                        error.model_dump() for error in validation_errors
-                    ],
+                    "type_inconsistencies": TYPE_INCONSISTENCIES_ADAPTER.dump_python(
+                        validation_errors, mode="json"
+                    ),
                     "message": "Type inconsistencies found in spreadsheet",
                 },
             )
 
-        sheets = builder.get_sheets()
-        logger.info(f"Spreadsheet validated successfully: {file_path}")
+        sheets = await asyncio.to_thread(builder.get_sheets)
+        logger.info("Spreadsheet validated successfully: {}", file_path)
 
         return {"status": "success", "file_path": file_path, "sheets": sheets}
 
     except FileNotFoundError as e:
-        logger.error(f"File not found error: {str(e)}")
+        logger.error("File not found error: {}", e)
         raise HTTPException(
             status_code=404, detail={"status": "error", "message": str(e)}
         )
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: {}", e)
         raise HTTPException(
             status_code=400, detail={"status": "error", "message": str(e)}
         )
     except Exception as e:
-        logger.error(f"Error validating spreadsheet: {str(e)}")
+        logger.error("Error validating spreadsheet: {}", e)
         raise HTTPException(
             status_code=500,
             detail={
                 "status": "error",
-                "message": f"Error validating spreadsheet: {str(e)}",
+                "message": f"Error validating spreadsheet: {e}",
             },
         )
 
@@ -161,59 +225,120 @@ async def process_spreadsheet(
         if not file_path:
             raise ValueError("No file path provided")
 
-        # Strip quotes from the path if present
-        file_path = file_path.strip('"').strip("'")
-
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found at path: {file_path}")
+        file_path = _resolve_upload(file_path)
 
         # get sheet model from file
         try:
-            with open("uploads/sheet_model.json", "r") as f:
-                sheet_model = SheetModel.model_validate_json(f.read())
+            st = await aiofiles.os.stat(SHEET_MODEL_PATH)
+            # a cache miss reads the file, so keep it off the event loop
+            async with _sheet_model_lock:
+                sheet_model = await asyncio.to_thread(
+                    _load_sheet_model, SHEET_MODEL_PATH, st.st_mtime_ns
+                )
         except FileNotFoundError:
             raise ValueError("Sheet model not found. Please save the model first.")
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            raise ValueError(f"Error reading sheet model: {errors}")
         except Exception as e:
-            raise ValueError(f"Error reading sheet model: {str(e)}")
+            raise ValueError(f"Error reading sheet model: {e}")
 
-        logger.info(f"Process using file path: {file_path}")
+        logger.info("Process using file path: {}", file_path)
 
-        logger.debug(f"sheet model received with keys: {sheet_model.__dict__.keys()}")
+        logger.debug("sheet model received with keys: {}", sheet_model.__dict__.keys())
 
         # Populate DB
         # load sheets from file
-        builder = SheetModelBuilder(path=file_path)
-        sheets = builder.sheets
+        sheets = (await _get_builder(file_path)).sheets
         db_populator = DatabasePopulator(
             sheets=sheets,
             source_file=file_path,
         )
-        db_populator.extract_to_db(db, sheet_model)
+        await asyncio.to_thread(db_populator.extract_to_db, db, sheet_model)
+        db.invalidate_schema_cache()
 
         # Return success
         return {"message": "Spreadsheet processed successfully"}
 
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: {}", e)
         raise HTTPException(
             status_code=400, detail={"status": "error", "message": str(e)}
         )
     except FileNotFoundError as e:
-        logger.error(f"File not found: {str(e)}")
+        logger.error("File not found: {}", e)
         raise HTTPException(
             status_code=404, detail={"status": "error", "message": str(e)}
         )
     except Exception as e:
-        logger.error(f"Error processing spreadsheet: {str(e)}")
+        logger.error("Error processing spreadsheet: {}", e)
         raise HTTPException(
             status_code=500,
             detail={
                 "status": "error",
-                "message": f"Error processing spreadsheet: {str(e)}",
+                "message": f"Error processing spreadsheet: {e}",
             },
         )
 
 
+def _build_xlsx(rows: List[Dict[str, Any]]) -> SpooledTemporaryFile:
+    """Builds the xlsx workbook for `/generate` from a list of row dicts."""
+    # Query results share one set of keys, so the first row usually defines
+    # the columns; only union keys in order of first appearance (as a
+    # DataFrame would align them) when rows actually differ
+    columns = list(rows[0])
+    first_keys = rows[0].keys()
+    if any(row.keys() != first_keys for row in rows):
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+    logger.debug("Writing {} rows with {} columns", len(rows), len(columns))
+
+    # Create the Excel file in memory, spilling to disk for large exports,
+    # writing rows straight to the worksheet
+    output = SpooledTemporaryFile(max_size=GENERATE_SPOOL_SIZE)
+    workbook = xlsxwriter.Workbook(
+        output,
+        # rows are written strictly in order, so they can be flushed as we go;
+        # skip per-cell URL detection, exported values are plain data
+        {"constant_memory": True, "strings_to_urls": False},
+    )
+    worksheet = workbook.add_worksheet("Data")
+
+    # Add some formatting
+    header_format = workbook.add_format(
+        {
+            "bold": True,
+            "text_wrap": True,
+            "valign": "top",
+            "bg_color": "#D9E1F2",
+            "border": 1,
+        }
+    )
+
+    # Write the column headers with the defined format
+    for col_num, column in enumerate(columns):
+        worksheet.write(0, col_num, column, header_format)
+
+    # Track column widths while writing so the data is only traversed once
+    max_lengths = [len(column) for column in columns]
+    for row_num, row in enumerate(rows, start=1):
+        for col_num, column in enumerate(columns):
+            value = row.get(column)
+            if isinstance(value, (dict, list)):
+                value = str(value)
+            worksheet.write(row_num, col_num, value)
+            length = len(str(value))
+            if length > max_lengths[col_num]:
+                max_lengths[col_num] = length
+
+    # Set column width based on content
+    for col_num, max_length in enumerate(max_lengths):
+        worksheet.set_column(col_num, col_num, max_length + 2)
+
+    workbook.close()
+    output.seek(0)
+    return output
+
+
 @router.post("/generate", tags=["Spreadsheet"])
 async def generate_spreadsheet(request: SpreadsheetRequest):
     logger.info("Generating spreadsheet from data")
@@ -222,38 +347,8 @@ async def generate_spreadsheet(request: SpreadsheetRequest):
         logger.warning("No data provided for spreadsheet generation")
         raise HTTPException(status_code=400, detail="No data provided")
 
-    # Convert data to pandas DataFrame
-    df = pd.DataFrame(request.data)
-    logger.debug(f"Created DataFrame with shape: {df.shape}")
-
-    # Create an Excel file in memory
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        df.to_excel(writer, index=False, sheet_name="Data")
-
-        # Get the workbook and worksheet objects
-        workbook = writer.book
-        worksheet = writer.sheets["Data"]
-
-        # Add some formatting
-        header_format = workbook.add_format(
-            {
-                "bold": True,
-                "text_wrap": True,
-                "valign": "top",
-                "bg_color": "#D9E1F2",
-                "border": 1,
-            }
-        )
-
-        # Write the column headers with the defined format
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-            # Set column width based on content
-            max_length = max(df[value].astype(str).apply(len).max(), len(str(value)))
-            worksheet.set_column(col_num, col_num, max_length + 2)
-
-    output.seek(0)
+    # xlsx serialization is CPU-bound, keep it off the event loop
+    output = await asyncio.to_thread(_build_xlsx, request.data)
     logger.info("Successfully generated spreadsheet")
 
     headers = {
@@ -264,4 +359,5 @@ async def generate_spreadsheet(request: SpreadsheetRequest):
         output,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers=headers,
+        background=BackgroundTask(output.close),
     )
@@ -1,15 +1,24 @@
 from dataclasses import dataclass
-from typing import List
 
 import pandas as pd
 
+# `infer_dtype` kinds that cannot hold a type inconsistency, mapped to the
+# column type reported for them
+HOMOGENEOUS_KIND_TYPES = {
+    "string": "str",
+    "boolean": "bool",
+    "integer": "float",
+    "floating": "float",
+    "mixed-integer-float": "float",
+}
+
 
 @dataclass
 class TypeInconsistency:
     column: str
     sheet_name: str
-    data_types: List[str]
-    rows: List[int]
+    data_types: list[str]
+    rows: list[int]
     path: str
 
 
@@ -23,65 +32,90 @@ class DataSanityChecker:
         self.df = df
         self.sheet_name = sheet_name
         self.path = path
-        self.inconsistencies: List[TypeInconsistency] = []
+        self.inconsistencies: list[TypeInconsistency] = []
+        self._column_analysis: dict[str, tuple[str, TypeInconsistency | None]] = {}
 
-    def check_column_type_consistency(self, column: str) -> bool:
+    def _analyze_column(self, column: str) -> tuple[str, TypeInconsistency | None]:
         """
-        Checks if a column has consistent types, allowing int/float mixing.
-        Returns True if types are consistent, False otherwise.
-        Also records any inconsistencies found.
+        Inspects a column once and returns its primary type together with the
+        type inconsistency found in it, if any. Results are cached per column.
         """
-        # Get non-empty values and their types
-        non_empty_values = self.df[column][pd.notna(self.df[column])]
-        data_types = set(non_empty_values.apply(lambda x: type(x).__name__).unique())
+        if column in self._column_analysis:
+            return self._column_analysis[column]
+
+        # Get non-empty values; a concrete dtype cannot mix types
+        values = self.df[column]
+        non_empty_values = values[values.notna()]
+        if non_empty_values.empty:
+            self._column_analysis[column] = ("str", None)
+            return self._column_analysis[column]
+
+        value_types = None
+        if non_empty_values.dtype == object:
+            # Most object columns hold a single kind of value, which pandas can
+            # tell in C without mapping every value to its type
+            kind = pd.api.types.infer_dtype(non_empty_values, skipna=False)
+            if kind in HOMOGENEOUS_KIND_TYPES:
+                self._column_analysis[column] = (HOMOGENEOUS_KIND_TYPES[kind], None)
+                return self._column_analysis[column]
+            # The rest are mostly mixed: map values to types once and reuse
+            # that for both the type set and locating inconsistent rows
+            value_types = non_empty_values.map(type)
+            unique_types = set(value_types.unique())
+        else:
+            # A concrete dtype holds a single type, so the first value tells it
+            unique_types = {type(non_empty_values.iloc[:1].tolist()[0])}
+
+        data_types = {t.__name__ for t in unique_types}
 
         # Define allowed type groups
         numeric_types = {"int", "float"}
-
-        # Check for type inconsistencies
         has_numeric = any(t in numeric_types for t in data_types)
         non_numeric_types = {t for t in data_types if t not in numeric_types}
 
-        # Case 1: Mixing numeric with non-numeric types
-        if has_numeric and non_numeric_types:
-            # Find rows with non-numeric types
-            inconsistent_rows = non_empty_values[
-                ~non_empty_values.apply(lambda x: type(x).__name__ in numeric_types)
-            ].index.tolist()
-            inconsistent_rows = [row + 2 for row in inconsistent_rows]
-
-            self.inconsistencies.append(
-                TypeInconsistency(
-                    column=column,
-                    sheet_name=self.sheet_name,
-                    data_types=list(data_types),
-                    rows=inconsistent_rows,
-                    path=self.path,
-                )
+        # Numeric columns are always treated as float, others use the first type
+        column_type = "float" if has_numeric else next(iter(data_types))
+
+        # Only object columns can mix types
+        expected_types = None
+        if value_types is not None:
+            # Case 1: Mixing numeric with non-numeric types
+            if has_numeric and non_numeric_types:
+                expected_types = [int, float]
+            # Case 2: Mixing different non-numeric types
+            elif len(non_numeric_types) > 1:
+                first_type = next(iter(non_numeric_types))
+                expected_types = [t for t in unique_types if t.__name__ == first_type]
+
+        inconsistency = None
+        if value_types is not None and expected_types is not None:
+            inconsistent_mask = ~value_types.isin(expected_types)
+            # +2: one for the header row, one because spreadsheet rows start at 1
+            inconsistent_rows = (
+                non_empty_values.index[inconsistent_mask.to_numpy()] + 2
+            ).tolist()
+            inconsistency = TypeInconsistency(
+                column=column,
+                sheet_name=self.sheet_name,
+                data_types=list(data_types),
+                rows=inconsistent_rows,
+                path=self.path,
             )
-            return False
-
-        # Case 2: Mixing different non-numeric types
-        if len(non_numeric_types) > 1:
-            # Find rows with types different from the first non-numeric type
-            first_type = next(iter(non_numeric_types))
-            inconsistent_rows = non_empty_values[
-                ~non_empty_values.apply(lambda x: type(x).__name__ == first_type)
-            ].index.tolist()
-            inconsistent_rows = [row + 2 for row in inconsistent_rows]
-
-            self.inconsistencies.append(
-                TypeInconsistency(
-                    column=column,
-                    sheet_name=self.sheet_name,
-                    data_types=list(data_types),
-                    rows=inconsistent_rows,
-                    path=self.path,
-                )
-            )
-            return False
 
-        return True
+        self._column_analysis[column] = (column_type, inconsistency)
+        return self._column_analysis[column]
+
+    def check_column_type_consistency(self, column: str) -> bool:
+        """
+        Checks if a column has consistent types, allowing int/float mixing.
+        Returns True if types are consistent, False otherwise.
+        Also records any inconsistencies found.
+        """
+        _, inconsistency = self._analyze_column(column)
+        if inconsistency is None:
+            return True
+        self.inconsistencies.append(inconsistency)
+        return False
 
     def get_column_type(self, column: str) -> str:
         """
@@ -89,35 +123,27 @@ class DataSanityChecker:
         For numeric columns (int/float), always returns 'float'.
         For other columns, returns the first non-numeric type found or falls back to 'str'.
         """
-        non_empty_values = self.df[column][pd.notna(self.df[column])]
-        data_types = set(non_empty_values.apply(lambda x: type(x).__name__).unique())
-        numeric_types = {"int", "float"}
-
-        # If we have any numeric types, treat as float
-        if any(t in numeric_types for t in data_types):
-            return "float"
-
-        # Otherwise return first type found or fallback to str
-        return next(iter(data_types)) if data_types else "str"
+        column_type, _ = self._analyze_column(column)
+        return column_type
 
     def eliminate_space_in_column_names(self):
         """Replace all spaces in column names with underscores"""
-        self.df.columns = self.df.columns.str.replace(" ", "_")
-
-    def get_all_inconsistencies(self) -> List[TypeInconsistency]:
+        columns = [
+            c.replace(" ", "_") if isinstance(c, str) else c for c in self.df.columns
+        ]
+        if columns != list(self.df.columns):
+            self.df.columns = columns
+            self._column_analysis = {}
+
+    def get_all_inconsistencies(self) -> list[TypeInconsistency]:
         """
         Checks all columns for type inconsistencies and returns a list of all found inconsistencies.
         """
-        self.inconsistencies = []  # Clear previous inconsistencies
-
-        for column in self.df.columns:
-            self.check_column_type_consistency(column)
-
+        # A concrete dtype cannot mix types, so only object columns are scanned
+        object_columns = self.df.select_dtypes(include="object").columns
+        self.inconsistencies = [
+            inconsistency
+            for column in object_columns
+            if (inconsistency := self._analyze_column(column)[1]) is not None
+        ]
         return self.inconsistencies
-
-
-if __name__ == "__main__":
-    df = pd.read_excel("test_data/genoscope/test.xlsx", sheet_name="reaction")
-    checker = DataSanityChecker(df, "reaction", "test_data/genoscope/test.xlsx")
-    print(checker.check_column_type_consistency("success"))
-    print(checker.inconsistencies)
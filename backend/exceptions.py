@@ -1,9 +1,11 @@
 from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 
 class TypeInconsistencyLocation(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     sheet_name: str
     column: str
     data_types: List[str]
@@ -11,6 +13,9 @@ class TypeInconsistencyLocation(BaseModel):
     path: str
 
 
+TYPE_INCONSISTENCIES_ADAPTER = TypeAdapter(List[TypeInconsistencyLocation])
+
+
 class TypeInconsistencyError(Exception):
     def __init__(self, inconsistencies: List[TypeInconsistencyLocation]):
         self.inconsistencies = inconsistencies
@@ -14,11 +14,11 @@ async def fetch_single_protein(
         await asyncio.sleep(0.1)  # Rate limiting
         response = await client.get(url)
         if response.status_code != 200:
-            logger.error(f"Failed to fetch protein sequence for {uniprot_id}")
+            logger.error("Failed to fetch protein sequence for {}", uniprot_id)
             return uniprot_id, None
         return uniprot_id, extract_protein_sequence(response.text)
     except Exception as e:
-        logger.error(f"Error fetching {uniprot_id}: {str(e)}")
+        logger.error("Error fetching {}: {}", uniprot_id, e)
         return uniprot_id, None
 
 
@@ -1,11 +1,22 @@
-from agents import Agent
+import asyncio
+
+from agents import Agent, set_default_openai_client
+from openai import AsyncOpenAI
 from pyenzyme import Measurement, MeasurementData, Protein, SmallMolecule
 
+from ..settings import config
 from .models import EvaluationReport, MappingReport
 from .tools import execute_query, get_graph_schema
 
 MODEL = "gpt-4.1-2025-04-14"
 
+# Shared bound on the number of agent runs in flight against the OpenAI API
+llm_slots = asyncio.Semaphore(config.llm_max_parallel)
+
+# Without a default client every Runner.run builds its own AsyncOpenAI, and with
+# it a fresh connection pool; one shared client keeps connections warm.
+set_default_openai_client(AsyncOpenAI(api_key=config.openai_api_key))
+
 biochemistry_semantics_agent = Agent(
     name="biochemistry_semantics_agent",
     instructions="""
@@ -179,6 +190,3 @@ question_dispatcher_agent = Agent(
     model=MODEL,
     handoffs=[cypher_translator_agent, data_analysis_agent],
 )
-
-if __name__ == "__main__":
-    print(SmallMolecule.model_json_schema())
@@ -1,17 +1,19 @@
+import asyncio
 import uuid
 from enum import Enum
 
-from agents import Runner
+from agents import Agent, Runner
 from loguru import logger
 
 from backend.llm.agents import (
+    llm_slots,
     mapping_evaluation_agent,
     measurement_agent,
     measurement_data_agent,
     protein_agent,
     small_molecule_agent,
 )
-from backend.llm.models import EvaluationReport
+from backend.llm.models import EvaluationReport, MappingReport
 
 
 class Phase(str, Enum):
@@ -28,29 +30,35 @@ class AgentOrchestrator:
         self.context = []
         self.session_id = str(uuid.uuid4())
 
+    async def _run_mapping_agent(self, agent: Agent, user_input: str) -> MappingReport:
+        async with llm_slots:
+            logger.info("Running {}...", agent.name)
+            result = await Runner.run(
+                starting_agent=agent,
+                input=user_input,
+                context=self.context,
+            )
+        report = result.final_output
+        report.agent_name = agent.name
+        logger.info("Received report from {}: {}", agent.name, result.final_output)
+        return report
+
     async def evaluate(self, user_input: str) -> EvaluationReport:
         phase = Phase.EVALUATE
-        # 1) run all agents for this phase
-        reports = []
-        for agent in [
+        # 1) run all agents for this phase; they are independent of each
+        # other, so they run concurrently
+        agents = [
             small_molecule_agent,
             protein_agent,
             measurement_agent,
             measurement_data_agent,
-        ][:2]:
-            logger.info(f"Running {agent.name}...")
-            result = await Runner.run(
-                starting_agent=agent,
-                input=user_input,
-                context=self.context,
-            )
-            report = result.final_output
-            report.agent_name = agent.name
-            logger.info(f"Received report from {agent.name}: {result.final_output}")
-            reports.append(result.final_output)
+        ][:2]
+        reports = await asyncio.gather(
+            *(self._run_mapping_agent(agent, user_input) for agent in agents)
+        )
 
         # 2) evaluate the reports by the mapping_evaluation_agent
-        logger.info(f"Evaluating reports by {mapping_evaluation_agent.name}...")
+        logger.info("Evaluating reports by {}...", mapping_evaluation_agent.name)
         message = f"""
         Here are the reports from the individual agents:
         {reports}
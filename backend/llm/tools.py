@@ -1,3 +1,5 @@
+import asyncio
+
 from agents import function_tool
 from loguru import logger
 
@@ -10,7 +12,8 @@ from ..services.database import get_db
 async def get_graph_schema():
     """Get the graph schema with information about labels, rel-types, property keys."""
     logger.debug("AGENT TOOL CALL: get_graph_schema")
-    return get_db().get_graph_info_dict
+    # the schema lookup may hit Neo4j, so keep it off the event loop
+    return await asyncio.to_thread(lambda: get_db().get_graph_info_dict)
 
 
 @function_tool
@@ -18,5 +21,5 @@ async def execute_query(query: str):
     """Execute a Cypher query and return the results.
     You can only use cypher queries that are allowed by the graph schema.
     """
-    logger.debug(f"AGENT TOOL CALL: execute_query with query: {query}")
-    return get_db().execute_query(query)
+    logger.debug("AGENT TOOL CALL: execute_query with query: {}", query)
+    return await get_db().execute_read_async(query)
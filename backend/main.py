@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 from backend.llm.orchestrator import AgentOrchestrator
+from backend.services.database import close_databases
 
 from .api.routes import config, database, llm, spreadsheet
 
@@ -21,8 +22,10 @@ async def lifespan(app: FastAPI):
     if not os.path.exists("uploads"):
         os.makedirs("uploads")
         logger.info("Created uploads directory")
+    config.validate_stored_sheet_model()
     yield
     logger.info("Shutting down FastAPI application")
+    close_databases()
 
 
 app = FastAPI(
@@ -79,7 +82,7 @@ async def llm_chat(websocket: WebSocket):
             try:
                 # Check turn limit
                 if chat_state.turn_count >= chat_state.max_turns:
-                    logger.warning(f"Maximum turns ({chat_state.max_turns}) exceeded")
+                    logger.warning("Maximum turns ({}) exceeded", chat_state.max_turns)
                     await websocket.send_text(
                         json.dumps(
                             {
@@ -94,12 +97,12 @@ async def llm_chat(websocket: WebSocket):
                 # Receive message from client
                 raw_message = await websocket.receive_text()
                 message: WebSocketMessage = json.loads(raw_message)
-                logger.info(f"Received message from client: {message}")
+                logger.info("Received message from client: {}", message)
 
                 # Run evaluation using orchestrator
                 reports = await chat_state.orchestrator.evaluate(message["content"])
                 chat_state.turn_count += 1
-                logger.info(f"Received reports: {reports}")
+                logger.info("Received reports: {}", reports)
 
                 # Send response back to client
                 response = {
@@ -107,14 +110,14 @@ async def llm_chat(websocket: WebSocket):
                     "content": str(reports.report),
                 }
                 await websocket.send_text(json.dumps(response))
-                logger.info(f"Sent response: {response}")
+                logger.info("Sent response: {}", response)
 
                 # Close the connection after sending final response
                 await websocket.close(code=1000)
                 break
 
             except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON message: {str(e)}")
+                logger.error("Invalid JSON message: {}", e)
                 await websocket.send_text(
                     json.dumps(
                         {
@@ -124,18 +127,18 @@ async def llm_chat(websocket: WebSocket):
                     )
                 )
             except Exception as e:
-                logger.error(f"Error processing message: {str(e)}")
+                logger.error("Error processing message: {}", e)
                 await websocket.send_text(
                     json.dumps(
                         {
                             "type": "error",
-                            "content": f"Sorry, there was an error processing your message. {str(e)}",
+                            "content": f"Sorry, there was an error processing your message. {e}",
                         }
                     )
                 )
 
     except Exception as e:
-        logger.error(f"WebSocket error: {str(e)}")
+        logger.error("WebSocket error: {}", e)
     finally:
         logger.info("WebSocket connection closed")
 
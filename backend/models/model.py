@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 ## Spreadsheet Model
 
@@ -33,6 +33,10 @@ class SheetModel(BaseModel):
     sheet_references: list[SheetReference] = Field(default_factory=list)
 
 
+# Built once and shared by everything that reads or writes the sheet model file
+SHEET_MODEL_ADAPTER = TypeAdapter(SheetModel)
+
+
 ## Neo4j Model
 
 
@@ -1,6 +1,8 @@
+import asyncio
 import threading
+import time
 from collections import defaultdict
-from typing import Annotated, Any, List
+from typing import Annotated, Any, Callable, List, TypeVar
 
 from fastapi import Depends
 from loguru import logger
@@ -10,6 +12,11 @@ from neo4j.exceptions import AuthError, ServiceUnavailable
 from backend.models.graph_model import Attribute, GraphModel, Node, Relationship
 from backend.settings import config
 
+T = TypeVar("T")
+
+# Seconds for which schema lookups are served from the per-database cache
+SCHEMA_CACHE_TTL = 60.0
+
 
 class DatabaseError(Exception):
     """Base exception for database-related errors."""
@@ -30,9 +37,8 @@ class DatabaseAuthenticationError(DatabaseError):
 
 
 class Database:
-    _instance: "Database | None" = None
-    _lock = threading.Lock()
-    _initialized: bool = False
+    """Neo4j connection. Use `get_db` rather than instantiating this directly,
+    so that one driver is shared per set of credentials."""
 
     def __init__(self, uri: str, username: str, password: str):
         self.uri = uri
@@ -40,9 +46,16 @@ class Database:
         self.password = password
         self.driver = self._connect()
         self._validate_connection()
+        self._schema_cache: dict[str, tuple[float, Any]] = {}
 
     def _connect(self):
-        return GraphDatabase.driver(self.uri, auth=(self.username, self.password))
+        return GraphDatabase.driver(
+            self.uri,
+            auth=(self.username, self.password),
+            # keep the driver's own retry budget inside the /llm/ask deadline
+            max_transaction_retry_time=15,
+            max_connection_pool_size=config.neo4j_max_connection_pool_size,
+        )
 
     def _validate_connection(self):
         try:
@@ -50,13 +63,13 @@ class Database:
                 s.run("RETURN 1").single()
             logger.info("Neo4j connection OK")
         except AuthError as e:
-            logger.error(f"Neo4j auth failed: {e}")
+            logger.error("Neo4j auth failed: {}", e)
             raise DatabaseAuthenticationError("Invalid Neo4j username or password.")
         except ServiceUnavailable as e:
-            logger.error(f"Neo4j connection failed: {e}")
+            logger.error("Neo4j connection failed: {}", e)
             raise DatabaseConnectionError("Could not connect to the Neo4j database.")
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: {}", e)
             raise DatabaseError("An unknown error occurred while connecting to Neo4j.")
 
     def close(self) -> None:
@@ -67,33 +80,87 @@ class Database:
         with self.driver.session() as session:
             return session.run(query).data()
 
+    async def execute_query_async(self, query: str):
+        """Runs `execute_query` in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self.execute_query, query)
+
+    def execute_read(self, query: str) -> list[dict[str, Any]]:
+        """Runs a query in a managed read transaction, which the driver retries
+        on transient errors and which rejects writes."""
+        with self.driver.session() as session:
+            return session.execute_read(lambda tx: tx.run(query).data())
+
+    async def execute_read_async(self, query: str) -> list[dict[str, Any]]:
+        """Runs `execute_read` in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self.execute_read, query)
+
+    def _cached_schema(self, key: str, load: Callable[[], T]) -> T:
+        """Returns the cached schema lookup for `key` if it is younger than
+        `SCHEMA_CACHE_TTL`, otherwise loads and caches it."""
+        now = time.monotonic()
+        entry = self._schema_cache.get(key)
+        if entry is not None and now - entry[0] < SCHEMA_CACHE_TTL:
+            return entry[1]
+        value = load()
+        self._schema_cache[key] = (now, value)
+        return value
+
+    def invalidate_schema_cache(self) -> None:
+        """Drops cached schema lookups, e.g. after the graph was modified."""
+        self._schema_cache.clear()
+
     @property
     def get_graph_info_dict(self) -> dict[str, Any]:
         """Returns a dictionary containing the graph schema information
         containing node labels, relationship types, and their properties.
         """
-        return dict(
-            nodes=self.node_properties,
-            relationships=self.relationships,
-            relationship_properties=self.relationship_properties,
+        return self._cached_schema(
+            "graph_info",
+            lambda: dict(
+                nodes=self.node_properties,
+                relationships=self.relationships,
+                relationship_properties=self.relationship_properties,
+            ),
         )
 
     @property
-    def relationship_properties(self) -> list[dict[str, Any]]:
+    def _relationship_meta(self) -> list[dict[str, Any]]:
         """
-        Returns a list of dictionaries containing the relationship types and their properties.
+        Returns the `apoc.meta.data()` rows describing relationships. Both
+        `relationships` and `relationship_properties` are derived from them,
+        so the schema scan runs once for the two.
         """
-        rel_properties_query = """
+        meta_query = """
             CALL apoc.meta.data()
             YIELD label, other, elementType, type, property
-            WHERE NOT type = "RELATIONSHIP" AND elementType = "relationship"
-            WITH label AS nodeLabels, collect(property) AS properties
-            RETURN {type: nodeLabels, properties: properties} AS output
+            WHERE (type = "RELATIONSHIP" AND elementType = "node")
+                OR (NOT type = "RELATIONSHIP" AND elementType = "relationship")
+            RETURN label, other, elementType, property
             """
 
-        with self.driver.session() as session:
-            response = session.run(rel_properties_query).data()
-            return [record["output"] for record in response]
+        def load() -> list[dict[str, Any]]:
+            with self.driver.session() as session:
+                return session.run(meta_query).data()
+
+        return self._cached_schema("relationship_meta", load)
+
+    @property
+    def relationship_properties(self) -> list[dict[str, Any]]:
+        """
+        Returns a list of dictionaries containing the relationship types and their properties.
+        """
+
+        def load() -> list[dict[str, Any]]:
+            properties: dict[str, list[str]] = defaultdict(list)
+            for row in self._relationship_meta:
+                if row["elementType"] == "relationship":
+                    properties[row["label"]].append(row["property"])
+            return [
+                {"type": rel_type, "properties": props}
+                for rel_type, props in properties.items()
+            ]
+
+        return self._cached_schema("relationship_properties", load)
 
     @property
     def relationships(self) -> list[Relationship]:
@@ -101,22 +168,25 @@ class Database:
         Returns a list of dictionaries containing the source node label,
         relationship type, and target node label.
         """
-        rel_query = """
-            CALL apoc.meta.data()
-            YIELD label, other, elementType, type, property
-            WHERE type = "RELATIONSHIP" AND elementType = "node"
-            RETURN {source: label, name: property, targets: other} AS output
-            """
-
-        with self.driver.session() as session:
-            response = session.run(rel_query).data()
-            return [Relationship(**record["output"]) for record in response]
+        return self._cached_schema(
+            "relationships",
+            lambda: [
+                Relationship(
+                    source=row["label"], name=row["property"], targets=row["other"]
+                )
+                for row in self._relationship_meta
+                if row["elementType"] == "node"
+            ],
+        )
 
     @property
     def get_db_structure(self) -> GraphModel:
-        return GraphModel(
-            nodes=self.node_properties,
-            relationships=self.relationships,
+        return self._cached_schema(
+            "db_structure",
+            lambda: GraphModel(
+                nodes=self.node_properties,
+                relationships=self.relationships,
+            ),
         )
 
     @property
@@ -154,26 +224,31 @@ class Database:
         label, property;
         """
 
-        node_dict = defaultdict(list)
-        nodes = []
-        with self.driver.session() as session:
-            response = session.run(node_query).data()
-
-        # group by label and collect attributes
-        for entry in response:
-            node_dict[entry["label"]].append(
-                Attribute(
-                    attr_name=entry["property"],
-                    example_val=entry["example"],
-                    # attr_type=entry["data_type"],
+        def load() -> List[Node]:
+            node_dict = defaultdict(list)
+            nodes = []
+            with self.driver.session() as session:
+                response = session.run(node_query).data()
+
+            # group by label and collect attributes
+            for entry in response:
+                node_dict[entry["label"]].append(
+                    Attribute(
+                        attr_name=entry["property"],
+                        example_val=entry["example"],
+                        # attr_type=entry["data_type"],
+                    )
                 )
-            )
 
-        # create nodes
-        for label, attributes in node_dict.items():
-            nodes.append(Node(name=label, attributes=attributes))
+            # create nodes
+            for label, attributes in node_dict.items():
+                nodes.append(Node(name=label, attributes=attributes))
+
+            return nodes
 
-        return nodes
+        # shared by `get_graph_info_dict` and `get_db_structure`, and the
+        # example lookup scans every node, so it is only run once per TTL
+        return self._cached_schema("node_properties", load)
 
     @property
     def node_count(self) -> dict[str, int]:
@@ -188,8 +263,30 @@ class Database:
         return response[0]["labels"]
 
 
+_databases: dict[tuple[str, str, str], Database] = {}
+_databases_lock = threading.Lock()
+
+
+def _get_database(uri: str, username: str, password: str) -> Database:
+    """Returns the cached database for the given credentials, connecting once."""
+    key = (uri, username, password)
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None:
+            db = _databases[key] = Database(uri, username, password)
+        return db
+
+
+def close_databases() -> None:
+    """Closes the drivers of all cached databases."""
+    with _databases_lock:
+        for db in _databases.values():
+            db.close()
+        _databases.clear()
+
+
 def get_db() -> Database:  # FastAPI dependency
-    return Database(config.neo4j_uri, config.neo4j_username, config.neo4j_password)
+    return _get_database(config.neo4j_uri, config.neo4j_username, config.neo4j_password)
 
 
 DB = Annotated[Database, Depends(get_db)]
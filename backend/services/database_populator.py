@@ -1,8 +1,11 @@
 import uuid
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 from loguru import logger
+from neo4j import ManagedTransaction, Session
 
 from backend.models.error_model import GraphValidationError, GraphValidationResult
 from backend.models.model import (
@@ -13,6 +16,61 @@ from backend.models.model import (
     SheetReference,
 )
 from backend.services.database import Database
+from backend.settings import config
+
+# Query texts only depend on labels and keys, so they are built once per
+# combination instead of once per row; values are always passed as parameters.
+
+
+def _quote(identifier: str) -> str:
+    """Backtick-quotes a label, key or relationship type for use in Cypher.
+
+    Identifiers cannot be passed as query parameters, so spreadsheet-derived
+    names are escaped instead of interpolated verbatim.
+    """
+    return "`" + str(identifier).replace("`", "``") + "`"
+
+
+@lru_cache(maxsize=256)
+def _index_query(label: str, key: str) -> str:
+    return f"CREATE INDEX IF NOT EXISTS FOR (n:{_quote(label)}) ON (n.{_quote(key)})"
+
+
+@lru_cache(maxsize=256)
+def _merge_node_query(label: str, pk: str) -> str:
+    return (
+        "UNWIND $rows AS row "
+        f"MERGE (n:{_quote(label)} {{{_quote(pk)}: row.value}}) SET n += row.props"
+    )
+
+
+@lru_cache(maxsize=256)
+def _match_merge_relationship_query(
+    source_label: str,
+    source_key: str,
+    target_label: str,
+    target_key: str,
+    relationship_type: str,
+) -> str:
+    return (
+        "UNWIND $rows AS row "
+        f"MATCH (s:{_quote(source_label)} {{{_quote(source_key)}: row.source_value}}), "
+        f"(t:{_quote(target_label)} {{{_quote(target_key)}: row.target_value}}) "
+        f"MERGE (s)-[r:{_quote(relationship_type)}]->(t)"
+    )
+
+
+def _write_batch(tx: ManagedTransaction, query: str, rows: List[Dict[str, Any]]):
+    tx.run(query, rows=rows).consume()
+
+
+def _run_batched(
+    session: Session, query: str, rows: List[Dict[str, Any]], batch_size: int
+) -> None:
+    # one UNWIND per batch keeps each transaction bounded; managed transactions
+    # are retried by the driver on transient errors such as lock timeouts
+    for start in range(0, len(rows), batch_size):
+        session.execute_write(_write_batch, query, rows[start : start + batch_size])
 
 
 class DatabasePopulator:
@@ -46,17 +104,11 @@ class DatabasePopulator:
         validation = GraphValidationResult(
             missing_sheets=[], missing_columns=[], missing_values=[]
         )
+        sheets_by_name = {sheet.name: sheet for sheet in sheet_model.sheets}
 
         for connection in connections:
             # Check source sheet
-            source_sheet = next(
-                (
-                    sheet
-                    for sheet in sheet_model.sheets
-                    if sheet.name == connection.source_sheet_name
-                ),
-                None,
-            )
+            source_sheet = sheets_by_name.get(connection.source_sheet_name)
             if source_sheet is None:
                 validation.missing_sheets.append(
                     GraphValidationError(
@@ -68,14 +120,7 @@ class DatabasePopulator:
                 continue
 
             # Check target sheet
-            target_sheet = next(
-                (
-                    sheet
-                    for sheet in sheet_model.sheets
-                    if sheet.name == connection.target_sheet_name
-                ),
-                None,
-            )
+            target_sheet = sheets_by_name.get(connection.target_sheet_name)
             if target_sheet is None:
                 validation.missing_sheets.append(
                     GraphValidationError(
@@ -87,7 +132,7 @@ class DatabasePopulator:
                 continue
 
             # Check key in source sheet
-            if connection.key not in [col.name for col in source_sheet.columns]:
+            if not any(col.name == connection.key for col in source_sheet.columns):
                 validation.missing_columns.append(
                     GraphValidationError(
                         error_type="missing_key",
@@ -97,7 +142,7 @@ class DatabasePopulator:
                 )
 
             # Check key in target sheet
-            if connection.key not in [col.name for col in target_sheet.columns]:
+            if not any(col.name == connection.key for col in target_sheet.columns):
                 validation.missing_columns.append(
                     GraphValidationError(
                         error_type="missing_key",
@@ -115,17 +160,11 @@ class DatabasePopulator:
         validation = GraphValidationResult(
             missing_sheets=[], missing_columns=[], missing_values=[]
         )
+        sheets_by_name = {sheet.name: sheet for sheet in sheet_model.sheets}
 
         for reference in references:
             # Check source sheet
-            source_sheet = next(
-                (
-                    sheet
-                    for sheet in sheet_model.sheets
-                    if sheet.name == reference.source_sheet_name
-                ),
-                None,
-            )
+            source_sheet = sheets_by_name.get(reference.source_sheet_name)
             if source_sheet is None:
                 validation.missing_sheets.append(
                     GraphValidationError(
@@ -137,14 +176,7 @@ class DatabasePopulator:
                 continue
 
             # Check target sheet
-            target_sheet = next(
-                (
-                    sheet
-                    for sheet in sheet_model.sheets
-                    if sheet.name == reference.target_sheet_name
-                ),
-                None,
-            )
+            target_sheet = sheets_by_name.get(reference.target_sheet_name)
             if target_sheet is None:
                 validation.missing_sheets.append(
                     GraphValidationError(
@@ -156,9 +188,9 @@ class DatabasePopulator:
                 continue
 
             # Check source column
-            if reference.source_column_name not in [
-                col.name for col in source_sheet.columns
-            ]:
+            if not any(
+                col.name == reference.source_column_name for col in source_sheet.columns
+            ):
                 validation.missing_columns.append(
                     GraphValidationError(
                         error_type="missing_column",
@@ -169,9 +201,9 @@ class DatabasePopulator:
                 continue
 
             # Check target column
-            if reference.target_column_name not in [
-                col.name for col in target_sheet.columns
-            ]:
+            if not any(
+                col.name == reference.target_column_name for col in target_sheet.columns
+            ):
                 validation.missing_columns.append(
                     GraphValidationError(
                         error_type="missing_column",
@@ -186,14 +218,17 @@ class DatabasePopulator:
                 reference.source_column_name
             ]
             source_values_as_lists = self._parse_source_values(source_values)
-            target_values = self.sheets[reference.target_sheet_name][
-                reference.target_column_name
-            ]
+            # a set makes each lookup O(1) instead of a scan of the target column
+            target_values = set(
+                self.sheets[reference.target_sheet_name][
+                    reference.target_column_name
+                ].tolist()
+            )
 
             for row_id, values in enumerate(source_values_as_lists):
                 if not values:  # Skip empty lists (from NaN values)
                     continue
-                missing = [v for v in values if v not in target_values.values]
+                missing = [v for v in values if v not in target_values]
                 if missing:
                     validation.missing_values.append(
                         GraphValidationError(
@@ -250,6 +285,70 @@ class DatabasePopulator:
         if all_errors.has_errors():
             raise ValueError(all_errors.format_error_message())
 
+    def _create_nodes(
+        self, db: Database, sheet_name: str, df: pd.DataFrame, batch_size: int
+    ) -> Tuple[str, str]:
+        """Creates the nodes of one sheet in its own session.
+
+        Returns:
+            The (label, primary key) pair that was indexed for the sheet
+        """
+        label = sheet_name
+
+        # 1 · detect candidate PK columns
+        pk_candidates = [
+            c
+            for c in df.columns
+            if c.isupper() and (c.endswith("_ID") or c.endswith("_KEY"))
+        ]
+
+        # 2 · decide PK
+        if len(pk_candidates) == 1:
+            pk = pk_candidates[0]
+        elif len(pk_candidates) == 0:
+            pk = "_row_uuid"
+            if "_row_uuid" not in df.columns:  # add synthetic UUIDs
+                # assign a copy: the input frames may be shared/cached
+                df = df.assign(_row_uuid=[str(uuid.uuid4()) for _ in range(len(df))])
+            logger.warning(
+                "Sheet '{}' has no PK column, using synthetic '_row_uuid' as PK.",
+                sheet_name,
+            )
+        else:
+            raise ValueError(
+                f"Sheet '{sheet_name}' has multiple candidate PK columns "
+                f"{pk_candidates}. Keep zero or exactly one."
+            )
+
+        logger.info("Creating nodes for '{}' (PK = '{}')", sheet_name, pk)
+
+        # one vectorized NaN mask instead of a pd.isna call per cell
+        present = df.notna().to_numpy()
+        pk_present = df[pk].notna().to_numpy()
+        columns = list(df.columns)
+
+        node_rows = []
+        for idx, record, row_present, has_pk in zip(
+            df.index, df.to_dict("records"), present, pk_present
+        ):
+            if not has_pk:
+                logger.warning("Skipping row {} with NaN PK in '{}'", idx, sheet_name)
+                continue
+
+            props = {
+                column: record[column]
+                for column, is_present in zip(columns, row_present)
+                if is_present
+            }
+            node_rows.append({"value": record[pk], "props": props})
+
+        # sessions are not thread-safe, so every sheet gets its own
+        with db.driver.session() as session:
+            session.run(_index_query(label, pk))
+            _run_batched(session, _merge_node_query(label, pk), node_rows, batch_size)
+
+        return label, pk
+
     def extract_to_db(self, db: Database, sheet_model: SheetModel) -> None:
         """Extracts the validated data and creates the corresponding graph structure in Neo4j.
 
@@ -271,107 +370,106 @@ class DatabasePopulator:
         #         df = self.sheets[name]
         #         primary_keys[name] = df.columns[0]
 
-        logger.info(f"Using primary keys: {primary_keys}")
-
-        with db.driver.session() as session:
-            # --- Step 1: Create Nodes ---
-            for sheet_name, df in self.sheets.items():
-                label = sheet_name
-
-                # 1 · detect candidate PK columns
-                pk_candidates = [
-                    c
-                    for c in df.columns
-                    if c.isupper() and (c.endswith("_ID") or c.endswith("_KEY"))
-                ]
-
-                # 2 · decide PK
-                if len(pk_candidates) == 1:
-                    pk = pk_candidates[0]
-                elif len(pk_candidates) == 0:
-                    pk = "_row_uuid"
-                    if "_row_uuid" not in df.columns:  # add synthetic UUIDs
-                        df["_row_uuid"] = [str(uuid.uuid4()) for _ in range(len(df))]
-                    logger.warning(
-                        f"Sheet '{sheet_name}' has no PK column, using synthetic '_row_uuid' as PK."
-                    )
-                else:
-                    raise ValueError(
-                        f"Sheet '{sheet_name}' has multiple candidate PK columns "
-                        f"{pk_candidates}. Keep zero or exactly one."
-                    )
+        logger.info("Using primary keys: {}", primary_keys)
+        batch_size = config.neo4j_write_batch_size
 
-                logger.info(f"Creating nodes for '{sheet_name}' (PK = '{pk}')")
+        # --- Step 1: Create Nodes ---
+        # Sheets map to distinct labels, so their nodes can be written in parallel
+        with ThreadPoolExecutor(max_workers=config.neo4j_write_concurrency) as pool:
+            indexed = set(
+                pool.map(
+                    lambda item: self._create_nodes(db, *item, batch_size),
+                    self.sheets.items(),
+                )
+            )
 
-                for idx, row in df.iterrows():
-                    value = row[pk]
-                    if pd.isna(value):
-                        logger.warning(
-                            f"Skipping row {idx} with NaN PK in '{sheet_name}'"
-                        )
-                        continue
+        # Relationship writes touch nodes of several labels and stay sequential
+        with db.driver.session() as session:
 
-                    props = row.to_dict()
-                    props = {k: v for k, v in props.items() if not pd.isna(v)}
+            def ensure_index(label: str, key: str) -> None:
+                # MERGE/MATCH on an unindexed property scans every node of the label
+                if (label, key) not in indexed:
+                    session.run(_index_query(label, key))
+                    indexed.add((label, key))
 
-                    cypher = f"MERGE (n:{label} {{{pk}: $value}}) SET n += $props"
-                    session.run(cypher, value=value, props=props)
+            def run_batched(query: str, rows: List[Dict[str, Any]]) -> None:
+                _run_batched(session, query, rows, batch_size)
 
             # --- Step 2: Create Relationships for Sheet Connections ---
             for connection in sheet_model.sheet_connections:
-                logger.info(f"Creating relationships for connection: {connection}")
+                logger.info("Creating relationships for connection: {}", connection)
                 source_label = connection.source_sheet_name
                 target_label = connection.target_sheet_name
                 key = connection.key
                 source_df = self.sheets[connection.source_sheet_name]
                 logger.info(
-                    f"Creating relationships for connection: {connection.source_sheet_name} -> {connection.edge_name} -> {connection.target_sheet_name}"
+                    "Creating relationships for connection: {} -> {} -> {}",
+                    connection.source_sheet_name,
+                    connection.edge_name,
+                    connection.target_sheet_name,
                 )
+                cypher_query = _match_merge_relationship_query(
+                    source_label, key, target_label, key, connection.edge_name.upper()
+                )
+                ensure_index(source_label, key)
+                ensure_index(target_label, key)
 
-                for _, row in source_df.iterrows():
-                    key_value = row[key]
+                connection_rows = []
+                for key_value in source_df[key]:
                     # Skip rows with NaN primary keys
                     if pd.isna(key_value):
                         logger.warning(
-                            f"Skipping row with NaN key value {key} in sheet {connection.source_sheet_name}"
+                            "Skipping row with NaN key value {} in sheet {}",
+                            key,
+                            connection.source_sheet_name,
                         )
                         continue
-
-                    cypher_query = (
-                        f"MATCH (s:{source_label} {{{key}: $key_value}}), "
-                        f"(t:{target_label} {{{key}: $key_value}}) "
-                        f"MERGE (s)-[r:{connection.edge_name.upper()}]->(t)"
-                    )
-                    logger.debug(
-                        f"Executing query: {cypher_query} with key_value={key_value}"
+                    connection_rows.append(
+                        {"source_value": key_value, "target_value": key_value}
                     )
-                    session.run(cypher_query, key_value=key_value)
+
+                logger.debug(
+                    "Executing query: {} for {} rows",
+                    cypher_query,
+                    len(connection_rows),
+                )
+                run_batched(cypher_query, connection_rows)
 
             # --- Step 3: Create Relationships for Sheet References ---
             for reference in sheet_model.sheet_references:
-                logger.info(f"Creating relationships for reference: {reference}")
+                logger.info("Creating relationships for reference: {}", reference)
                 source_df = self.sheets[reference.source_sheet_name]
                 # Generate a relationship type; here we use the source column name.
                 relationship_type = reference.source_column_name.upper()
 
                 logger.info(
-                    f"Creating reference relationships: {reference.source_sheet_name}.{reference.source_column_name} -> "
-                    f"{reference.target_sheet_name}.{reference.target_column_name}"
+                    "Creating reference relationships: {}.{} -> {}.{}",
+                    reference.source_sheet_name,
+                    reference.source_column_name,
+                    reference.target_sheet_name,
+                    reference.target_column_name,
                 )
-
-                for _, row in source_df.iterrows():
-                    source_node_id = row[reference.source_column_name]
-                    # Skip rows with NaN primary keys
-                    if pd.isna(source_node_id):
-                        logger.warning(
-                            f"Skipping row with NaN primary key {reference.source_column_name} in sheet {reference.source_sheet_name}"
-                        )
-                        continue
-
-                    cell_value = row[reference.source_column_name]
+                cypher_query = _match_merge_relationship_query(
+                    reference.source_sheet_name,
+                    reference.source_column_name,
+                    reference.target_sheet_name,
+                    reference.target_column_name,
+                    relationship_type,
+                )
+                ensure_index(reference.source_sheet_name, reference.source_column_name)
+                ensure_index(reference.target_sheet_name, reference.target_column_name)
+
+                reference_rows = []
+                for row_id, cell_value in source_df[
+                    reference.source_column_name
+                ].items():
+                    # Skip rows without a reference value
                     if pd.isna(cell_value):
                         logger.warning(
-                            f"Skipping NaN value in column {reference.source_column_name} for row with pk={source_node_id}"
+                            "Skipping row {} with NaN reference value in column {} of sheet {}",
+                            row_id + 2,
+                            reference.source_column_name,
+                            reference.source_sheet_name,
                         )
                         continue
 
@@ -381,24 +479,22 @@ class DatabasePopulator:
 
                     if not tokens:
                         logger.warning(
-                            f"No valid tokens found in '{cell_value}' for row with pk={source_node_id}"
+                            "No valid tokens found in '{}' in row {} of sheet {}",
+                            cell_value,
+                            row_id + 2,
+                            reference.source_sheet_name,
                         )
                         continue
 
-                    for token in tokens:
-                        cypher_query = (
-                            f"MATCH (s:{reference.source_sheet_name} {{{reference.source_column_name}: $source_id}}), "
-                            f"(t:{reference.target_sheet_name} {{{reference.target_column_name}: $target_value}}) "
-                            f"MERGE (s)-[r:{relationship_type}]->(t)"
-                        )
-                        logger.debug(
-                            f"Executing query: {cypher_query} with source_id={source_node_id}, target_value={token}"
-                        )
-                        session.run(
-                            cypher_query,
-                            source_id=source_node_id,
-                            target_value=token,
-                        )
+                    reference_rows.extend(
+                        {"source_value": cell_value, "target_value": token}
+                        for token in tokens
+                    )
+
+                logger.debug(
+                    "Executing query: {} for {} rows", cypher_query, len(reference_rows)
+                )
+                run_batched(cypher_query, reference_rows)
 
         logger.info("Data extraction completed successfully")
 
@@ -13,6 +13,10 @@ from backend.models.model import (
     SheetReference,
 )
 
+# `infer_dtype` kinds of object columns that may contain strings among other
+# values; these are stripped value by value
+MIXED_KINDS = {"mixed", "mixed-integer"}
+
 
 class SheetModelBuilder:
     """Cleans and validates sheet data and defined connections and references."""
@@ -29,6 +33,7 @@ class SheetModelBuilder:
         # Initialize sheets
         self.sheets = self._load_excel_sheets()
         self._clean_sheet_data()
+        self._checkers: Dict[str, DataSanityChecker] = {}
 
     def _load_excel_sheets(self) -> Dict[str, pd.DataFrame]:
         """Load all sheets from Excel file into memory.
@@ -36,13 +41,12 @@ class SheetModelBuilder:
         Returns:
             Dictionary mapping sheet names to DataFrames
         """
-        excel_file = pd.ExcelFile(self.path)
-        sheet_names = [str(name) for name in excel_file.sheet_names]
-        sheets = {
-            name: pd.read_excel(excel_file, sheet_name=name) for name in sheet_names
-        }
-        excel_file.close()
-        return sheets
+        # calamine parses the workbook in native code, far faster than openpyxl
+        with pd.ExcelFile(self.path, engine="calamine") as excel_file:
+            return {
+                str(name): excel_file.parse(sheet_name=name)
+                for name in excel_file.sheet_names
+            }
 
     def _clean_sheet_data(self) -> None:
         """Clean all string data in sheets by stripping whitespace.
@@ -53,11 +57,37 @@ class SheetModelBuilder:
         for sheet_name, df in self.sheets.items():
             for column in df.columns:
                 # Only clean string (object) columns
-                if df[column].dtype == "object":
-                    # Strip whitespace and handle NaN values
+                if df[column].dtype != "object":
+                    continue
+                kind = pd.api.types.infer_dtype(df[column])
+                if kind == "string":
+                    self.sheets[sheet_name][column] = (
+                        df[column].str.strip().str.rstrip(",")
+                    )
+                elif kind in MIXED_KINDS:
+                    # a mixed column need not hold any strings, so `.str`
+                    # cannot be used on it
                     self.sheets[sheet_name][column] = df[column].apply(
                         lambda x: x.strip().rstrip(",") if isinstance(x, str) else x
                     )
+                else:
+                    # no strings to strip; still settle e.g. all-datetime
+                    # columns on a concrete dtype
+                    self.sheets[sheet_name][column] = df[column].infer_objects()
+
+    def _get_checker(self, sheet_name: str) -> DataSanityChecker:
+        """Get the sanity checker for a sheet, creating it on first use.
+
+        Sharing one checker per sheet lets validation and `get_sheets` reuse
+        the same per-sheet state instead of rebuilding it.
+        """
+        checker = self._checkers.get(sheet_name)
+        if checker is None:
+            checker = DataSanityChecker(
+                df=self.sheets[sheet_name], sheet_name=sheet_name, path=self.path
+            )
+            self._checkers[sheet_name] = checker
+        return checker
 
     def validate_spreadsheet_data(self) -> List[TypeInconsistencyLocation]:
         """Validates the data types and consistency within the spreadsheet.
@@ -71,18 +101,12 @@ class SheetModelBuilder:
             No exceptions - collects and returns all inconsistencies
         """
         all_inconsistencies = []
-        for sheet_name, df in self.sheets.items():
-            checker = DataSanityChecker(df=df, sheet_name=sheet_name, path=self.path)
+        for sheet_name in self.sheets:
+            checker = self._get_checker(sheet_name)
             inconsistencies = checker.get_all_inconsistencies()
             all_inconsistencies.extend(
                 [
-                    TypeInconsistencyLocation(
-                        sheet_name=inc.sheet_name,
-                        column=inc.column,
-                        data_types=inc.data_types,
-                        rows=inc.rows,
-                        path=inc.path,
-                    )
+                    TypeInconsistencyLocation.model_validate(inc)
                     for inc in inconsistencies
                 ]
             )
@@ -96,7 +120,7 @@ class SheetModelBuilder:
         """
         sheets = []
         for sheet_name, df in self.sheets.items():
-            checker = DataSanityChecker(df=df, sheet_name=sheet_name, path=self.path)
+            checker = self._get_checker(sheet_name)
             columns = []
             for column in df.columns:
                 data_type = checker.get_column_type(column)
@@ -200,7 +224,7 @@ class SheetModelBuilder:
         # Create sheets with proper data types
         sheets = []
         for sheet_name, df in self.sheets.items():
-            checker = DataSanityChecker(df=df, sheet_name=sheet_name, path=self.path)
+            checker = self._get_checker(sheet_name)
             columns = []
             for column in df.columns:
                 data_type = checker.get_column_type(column)
@@ -7,7 +7,13 @@ class Settings(BaseSettings):
     neo4j_uri: str
     neo4j_username: str
     neo4j_password: str
+    neo4j_max_connection_pool_size: int = 50
+    neo4j_write_batch_size: int = 5000
+    neo4j_write_concurrency: int = 4
     openai_api_key: str
+    llm_max_parallel: int = 4
 
 
+# Parsed from the environment and .env once at import. Use this instance instead
+# of creating new Settings objects, which would re-read .env each time.
 config = Settings()  # type: ignore